@@ -1,24 +1,49 @@
 import logging
 import os
 import asyncio
+import atexit
+import csv
+import io
+import queue
+import re
+import threading
+import time
+from collections.abc import Callable, Hashable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TypeVar
+from contextlib import suppress
+from logging.handlers import QueueHandler, QueueListener
 from redshift_connector import Connection
 from mcp.server import Server
 from mcp.types import Resource, ResourceTemplate, Tool, TextContent
 from pydantic import AnyUrl
 import redshift_connector
 
-# init logger
+# init logger, records are written to the file by a background listener thread
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_log_file_handler = logging.FileHandler('redshift_mcp_log.out', delay=True)
+_log_file_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+_log_listener = QueueListener(_log_queue, _log_file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# the file handler owns the layout, the queue handler only renders the message
+_log_queue_handler = QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 logging.basicConfig(
     level = logging.INFO,
-    format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers= [
-        logging.FileHandler('redshift_mcp_log.out')
+        _log_queue_handler
     ]
 )
 logger = logging.getLogger('redshift-mcp-server')
 
 rs_scheme = "rs://"
 mime_txt = "text/plain"
+_IDENT_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
 
 # Init MCP Server
 server = Server("redshift-mcp-server")
@@ -26,8 +51,9 @@ server.version = "0.1.0"
 
 # server = FastMCP("redshift-mcp-server")
 
-def get_redshift_config()-> dict[str, str]:
-    """Get database configuration from environment variables."""
+@lru_cache(maxsize=1)
+def get_redshift_config()-> Mapping[str, str]:
+    """Get database configuration from environment variables, read once per process."""
     config = {
         "host": os.getenv("RS_HOST", "localhost"),
         "port": os.getenv("RS_PORT", "5439"),
@@ -39,147 +65,465 @@ def get_redshift_config()-> dict[str, str]:
 
     return config
 
+rs_port = int(get_redshift_config()["port"])
+
+def is_valid_identifier(name: str) -> bool:
+    """Check whether name is a plain SQL identifier that is safe to quote locally."""
+    return _IDENT_RE.match(name) is not None
+
+# connection pool
+pool_size = int(os.getenv("RS_POOL_SIZE", "4"))
+_pool: asyncio.Queue[Connection] | None = None
+_pool_slots: asyncio.Semaphore | None = None
+# warm-up connects still in flight that no request has taken over yet
+_warming: list[Future[Connection]] = []
+_pool_closed = False
+# connections handed to a request and not yet released or closed
+_checked_out: set[Connection] = set()
+
+# rows fetched per fetchmany batch when reading execute_sql results
+batch_size = int(os.getenv("RS_BATCH_SIZE", "5000"))
+
+# execute_sql result caps, results beyond either limit are truncated
+max_rows = int(os.getenv("RS_MAX_ROWS", "100000"))
+max_bytes = int(os.getenv("RS_MAX_BYTES", "8000000"))
+# comments, string literals and quoted identifiers, masked out before inspecting a statement
+_SQL_NOISE_RE = re.compile(r"(--[^\n]*|/\*.*?\*/)|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"", re.DOTALL)
+_SELECT_RE = re.compile(r'\s*(select|with)\b', re.IGNORECASE)
+# SELECT ... INTO creates a table and WITH can lead into a write, a LIMIT
+# would change what they write
+_WRITE_RE = re.compile(r'\b(insert|update|delete|into)\b', re.IGNORECASE)
+# trailing outer LIMIT n / OFFSET m clauses of a statement
+_TAIL_RE = re.compile(
+    r'(?P<limit>\blimit\s+(?P<count>\d+|all)\s*)?(?P<offset>\boffset\s+\d+\s*)?$', re.IGNORECASE
+)
+
+# worker threads for blocking redshift_connector calls, one per pooled connection
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="rs-db")
+
+T = TypeVar("T")
+
+async def run_db(func: Callable[..., T], *args) -> T:
+    """Run a blocking database call on the dedicated DB executor."""
+    return await asyncio.get_running_loop().run_in_executor(_DB_EXECUTOR, func, *args)
+
+def _connect() -> Connection:
+    """Open a new autocommit connection to redshift."""
+    config = get_redshift_config()
+    conn = redshift_connector.connect(
+        host=config['host'],
+        port=rs_port,
+        user=config['user'],
+        password=config['password'],
+        database=config['database'],
+    )
+    conn.autocommit = True
+    return conn
+
+def _get_pool() -> tuple[asyncio.Queue[Connection], asyncio.Semaphore]:
+    """Create the idle connection queue and checkout semaphore on first use."""
+    global _pool, _pool_slots
+    if _pool is None or _pool_slots is None:
+        _pool = asyncio.Queue(maxsize=pool_size)
+        _pool_slots = asyncio.Semaphore(pool_size)
+    return _pool, _pool_slots
+
+async def run_pooled(func: Callable[..., T], *args) -> T:
+    """Run ``func(conn, *args)`` on the DB executor with a pooled connection.
+
+    At most ``RS_POOL_SIZE`` connections are checked out at once. An idle
+    connection is pinged before use and replaced if it went stale (cluster
+    restart, dropped socket). ``func`` itself runs exactly once, it is never
+    retried since the server may already have executed the statement. A
+    connection is closed if the call raised.
+    """
+    pool, slots = _get_pool()
+    loop = asyncio.get_running_loop()
+
+    await slots.acquire()
+    try:
+        idle = pool.get_nowait()
+    except asyncio.QueueEmpty:
+        idle = None
+
+    conn = None
+    if idle is None and _warming:
+        # take over a warm-up connect rather than queueing a new one behind it
+        warm = _warming.pop(0)
+        try:
+            conn = await asyncio.wrap_future(warm)
+        except asyncio.CancelledError:
+            _abandon(warm, loop, slots, None, result_is_conn=True)
+            raise
+        except Exception:
+            conn = None
+
+    if conn is None:
+        checkout = _DB_EXECUTOR.submit(_checkout, idle)
+        try:
+            conn = await asyncio.wrap_future(checkout)
+        except asyncio.CancelledError:
+            _abandon(checkout, loop, slots, idle, result_is_conn=True)
+            raise
+        except BaseException:
+            slots.release()
+            raise
+
+    _checked_out.add(conn)
+    work = _DB_EXECUTOR.submit(func, conn, *args)
+    try:
+        result = await asyncio.wrap_future(work)
+    except asyncio.CancelledError:
+        _abandon(work, loop, slots, conn)
+        raise
+    except BaseException:
+        _close(conn)
+        slots.release()
+        raise
+
+    _release(pool, conn)
+    slots.release()
+    return result
+
+def _abandon(
+    future: Future, loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore,
+    conn: Connection | None, result_is_conn: bool = False
+) -> None:
+    """Clean up after a cancelled request once its worker thread is done.
+
+    The worker may still be using the connection, and connections are not
+    thread-safe, so it is only closed, and the request's pool slot only
+    freed, when the future completes. With result_is_conn the future's
+    result is the connection to close, conn is closed if it never ran.
+    """
+    def done(f: Future) -> None:
+        if result_is_conn and not f.cancelled() and f.exception() is None:
+            _close(f.result())
+        elif conn is not None:
+            _close(conn)
+        # the loop is gone if the server already shut down
+        with suppress(RuntimeError):
+            loop.call_soon_threadsafe(slots.release)
+
+    future.add_done_callback(done)
+
+def _checkout(idle: Connection | None) -> Connection:
+    """Return idle if it still answers a ping, otherwise a new connection."""
+    if idle is not None:
+        try:
+            with idle.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            return idle
+        except Exception:
+            # InterfaceError/OperationalError, or a bare OSError on a reset socket
+            logger.info("Replacing stale pooled Redshift connection")
+            _close(idle)
+    return _connect()
+
+def _release(pool: asyncio.Queue[Connection], conn: Connection) -> None:
+    """Return a connection to the idle pool.
+
+    Connections left inside a transaction (e.g. after ``BEGIN`` through
+    execute_sql) are closed rather than handed to unrelated requests, as are
+    connections that do not fit in an already full pool or come back after
+    the pool was closed.
+    """
+    _checked_out.discard(conn)
+    if conn.in_transaction or _pool_closed:
+        _close(conn)
+        return
+    try:
+        pool.put_nowait(conn)
+    except asyncio.QueueFull:
+        _close(conn)
+
+def _close(conn: Connection) -> None:
+    """Close a connection, ignoring errors from an already broken socket."""
+    _checked_out.discard(conn)
+    with suppress(Exception):
+        conn.close()
+
+def warm_pool() -> None:
+    """Start opening the idle pool connections in the DB executor.
+
+    Called at startup so the first requests find a warm connection instead
+    of paying the connect latency themselves. A request that finds the idle
+    queue empty while these connects are in flight takes one over instead of
+    opening an extra connection behind them.
+    """
+    pool, _ = _get_pool()
+    loop = asyncio.get_running_loop()
+    for _ in range(pool.maxsize - pool.qsize()):
+        future = _DB_EXECUTOR.submit(_connect)
+        _warming.append(future)
+        future.add_done_callback(lambda f: _on_warmed(f, loop, pool))
+
+def _on_warmed(future: Future[Connection], loop: asyncio.AbstractEventLoop,
+               pool: asyncio.Queue[Connection]) -> None:
+    """Hand a finished warm-up connect back to the event loop, runs in the worker thread."""
+    if _pool_closed:
+        _close_connected(future)
+        return
+    try:
+        loop.call_soon_threadsafe(_pool_warmed, future, pool)
+    except RuntimeError:
+        # the loop is already closed
+        _close_connected(future)
+
+def _pool_warmed(future: Future[Connection], pool: asyncio.Queue[Connection]) -> None:
+    """Put an unclaimed warm-up connection into the idle queue."""
+    if future not in _warming:
+        # a request took it over
+        return
+    _warming.remove(future)
+    if _pool_closed:
+        _close_connected(future)
+    elif future.cancelled():
+        return
+    elif (e := future.exception()) is not None:
+        logger.warning("Failed to warm Redshift connection: %s", e)
+    else:
+        _release(pool, future.result())
+
+def _close_connected(future: Future[Connection]) -> None:
+    """Close the connection an abandoned connect produced, if any."""
+    if not future.cancelled() and future.exception() is None:
+        _close(future.result())
+
+def close_pool() -> None:
+    """Close all pooled connections, including those still warming up or in use.
+
+    Closing a checked-out connection makes the statement running on it fail,
+    so its worker thread returns instead of holding up interpreter exit.
+    """
+    global _pool_closed
+    _pool_closed = True
+    for future in _warming:
+        future.cancel()
+    for conn in list(_checked_out):
+        _close(conn)
+    if _pool is None:
+        return
+    while not _pool.empty():
+        _close(_pool.get_nowait())
+
+class _TTLCache:
+    """Thread-safe in-process cache whose entries expire ttl seconds after being stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict[Hashable, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> str | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, value: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                # evict the oldest entry
+                del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+# catalog lookups, keyed by () for schemas, (schema,) for tables and (schema, table) for DDL
+_schema_cache = _TTLCache(maxsize=1, ttl=30)
+_table_cache = _TTLCache(maxsize=128, ttl=30)
+_ddl_cache = _TTLCache(maxsize=256, ttl=60)
+
+def _clear_catalog_caches() -> None:
+    """Drop cached catalog lookups after a statement that may have changed them."""
+    _schema_cache.clear()
+    _table_cache.clear()
+    _ddl_cache.clear()
+
+_STATIC_RESOURCES: list[Resource] = [
+    Resource(
+        uri = AnyUrl(f"{rs_scheme}/schemas"),
+        name = "All Schemas in Databases",
+        description="List all schemas in Redshift database",
+        mimeType = mime_txt
+    )
+]
+
 @server.list_resources()
 async def list_resources() -> list[Resource]:
     """List basic Redshift resources."""
-    return [
-        Resource(
-            uri = AnyUrl(f"{rs_scheme}/schemas"),
-            name = "All Schemas in Databases",
-            description="List all schemas in Redshift database",
-            mimeType = mime_txt
-        )
-    ]
+    return _STATIC_RESOURCES
+
+_STATIC_TEMPLATES: list[ResourceTemplate] = [
+    ResourceTemplate(
+        uriTemplate= f"{rs_scheme}/{{schema}}/tables",
+        name = "Schema Tables",
+        description="List all tables in a schema",
+        mimeType= mime_txt
+    ),
+    ResourceTemplate(
+        uriTemplate= f"{rs_scheme}/{{schema}}/{{table}}/ddl",
+        name = "Table DDL",
+        description="Get a table's DDL script",
+        mimeType= mime_txt
+    ),
+    ResourceTemplate(
+        uriTemplate= f"{rs_scheme}/{{schema}}/ddl-all",
+        name = "Schema DDL",
+        description="Get the DDL scripts of all tables in a schema",
+        mimeType= mime_txt
+    ),
+    ResourceTemplate(
+        uriTemplate= f"{rs_scheme}/{{schema}}/{{table}}/statistic",
+        name = "Table Statistic",
+        description="Get statistic of a table",
+        mimeType= mime_txt
+    )
+]
 
 @server.list_resource_templates()
 async def list_resource_templates() -> list[ResourceTemplate]:
     """Tables/DDL/statistic Resource Templates"""
-    return [
-        ResourceTemplate(
-            uriTemplate= f"{rs_scheme}/{{schema}}/tables",
-            name = "Schema Tables",
-            description="List all tables in a schema",
-            mimeType= mime_txt
-        ),
-        ResourceTemplate(
-            uriTemplate= f"{rs_scheme}/{{schema}}/{{table}}/ddl",
-            name = "Table DDL",
-            description="Get a table's DDL script",
-            mimeType= mime_txt
-        ),
-        ResourceTemplate(
-            uriTemplate= f"{rs_scheme}/{{schema}}/{{table}}/statistic",
-            name = "Table Statistic",
-            description="Get statistic of a table",
-            mimeType= mime_txt
-        )
-    ]
+    return _STATIC_TEMPLATES
+
+# resource handlers keyed by (segment count, last segment) of the rs:/// URI path
+_ROUTES = {
+    # list all schemas
+    (1, "schemas"): lambda conn, parts: _get_schemas(conn),
+    # list all tables
+    (2, "tables"): lambda conn, parts: _get_tables(conn, parts[0]),
+    # get dll of all tables in a schema
+    (2, "ddl-all"): lambda conn, parts: _get_schema_ddl(conn, parts[0]),
+    # get table dll
+    (3, "ddl"): lambda conn, parts: _get_table_ddl(conn, parts[0], parts[1]),
+    # get table statistic
+    (3, "statistic"): lambda conn, parts: _get_table_statistic(conn, parts[0], parts[1]),
+}
 
 @server.read_resource()
 async def read_resource(uri: AnyUrl) -> str:
     """Get resource content based on URI."""
-    config = get_redshift_config()
     uri_str = str(uri)
 
     if not (uri_str.startswith(rs_scheme)):
       raise ValueError(f"Invalid URI schema: {uri}")
 
+    # split rs:/// URI path
+    path_parts = uri_str.removeprefix(rs_scheme).lstrip('/').split('/', 3)
+    handler = _ROUTES.get((len(path_parts), path_parts[-1]))
+    if handler is None or not all(path_parts):
+        raise ValueError(f"Unsupported URI: {uri}")
+
     try:
-        conn = redshift_connector.connect(
-            host=config['host'],
-            port=int(config['port']),
-            user=config['user'],
-            password=config['password'],
-            database=config['database'],
-        )
-        conn.autocommit = True
-        # split rs:/// URI path
-        path_parts = uri_str[6:].split('/')
-
-        if path_parts[0] == 'schemas':
-            # list all schemas
-            return _get_schemas(conn)
-        elif len(path_parts) == 2 and path_parts[1] == "tables":
-            # list all tables
-            return _get_tables(conn, path_parts[0])
-        elif len(path_parts) == 3 and path_parts[2] == "ddl":
-            # get table dll
-            schema, table  = path_parts[0], path_parts[1]
-            return _get_table_ddl(conn, schema, table)
-        elif len(path_parts) == 3 and path_parts[2] == "statistic":
-            # get table dll
-            schema, table  = path_parts[0], path_parts[1]
-            return _get_table_statistic(conn, schema, table)
+        return await run_pooled(handler, path_parts)
 
     except Exception as e:
         raise RuntimeError(f"Redshift Error: {str(e)}")
-    finally:
-        conn.close()
+
+_STATIC_TOOLS: list[Tool] = [
+    Tool(
+        name="execute_sql",
+        description="Execute a SQL Query on the Redshift cluster",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sql": {
+                    "type": "string",
+                    "description": "The SQL to Execute"
+                }
+            },
+            "required": ["sql"]
+        }
+    ),
+    Tool(
+        name="analyze_table",
+        description="Analyze table to collect statistics information",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "schema": {
+                    "type": "string",
+                    "description": "Schema name"
+                },
+                "table": {
+                    "type": "string",
+                    "description": "Table name"
+                }
+            },
+            "required": ["schema", "table"]
+        }
+    ),
+    Tool(
+        name="batch_analyze_tables",
+        description="Analyze several tables in one call to collect statistics information",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tables": {
+                    "type": "array",
+                    "description": "Tables to analyze",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "schema": {
+                                "type": "string",
+                                "description": "Schema name"
+                            },
+                            "table": {
+                                "type": "string",
+                                "description": "Table name"
+                            }
+                        },
+                        "required": ["schema", "table"]
+                    }
+                }
+            },
+            "required": ["tables"]
+        }
+    ),
+    Tool(
+        name="get_execution_plan",
+        description="Get actual execution plan with runtime statistics for a SQL query",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sql": {
+                    "type": "string",
+                    "description": "The SQL query to analyze"
+                }
+            },
+            "required": ["sql"]
+        }
+    )
+]
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available Redsfhit tools"""
     logger.info("List available tools...")
-
-    return [
-        Tool(
-            name="execute_sql",
-            description="Execute a SQL Query on the Redshift cluster",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sql": {
-                        "type": "string",
-                        "description": "The SQL to Execute"
-                    }
-                },
-                "required": ["sql"]
-            }
-        ),
-        Tool(
-            name="analyze_table",
-            description="Analyze table to collect statistics information",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "schema": {
-                        "type": "string",
-                        "description": "Schema name"
-                    },
-                    "table": {
-                        "type": "string",
-                        "description": "Table name"
-                    }
-                },
-                "required": ["schema", "table"]
-            }
-        ),
-        Tool(
-            name="get_execution_plan",
-            description="Get actual execution plan with runtime statistics for a SQL query",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sql": {
-                        "type": "string",
-                        "description": "The SQL query to analyze"
-                    }
-                },
-                "required": ["sql"]
-            }
-        )
-    ]
+    return _STATIC_TOOLS
 
 @server.call_tool()
 async def call_tool(name: str, args: dict) -> list[TextContent]:
     """Execute SQL"""
-    config=get_redshift_config()
     sql = ''
+    pairs: list[tuple[str, str]] = []
 
     if name == "execute_sql":
         sql = args.get("sql")
         if not sql:
             raise ValueError("sql parameter is required when calling execute_sql tool")
+        sql = _limit_sql(sql)
     elif name == "analyze_table":
         schema = args.get("schema")
         table = args.get("table")
@@ -191,36 +535,148 @@ async def call_tool(name: str, args: dict) -> list[TextContent]:
         if not sql:
             raise ValueError("sql parameter is required when calling get_query_plan tool")
         sql = f"EXPLAIN {sql}"
+    elif name == "batch_analyze_tables":
+        tables = args.get("tables")
+        if not tables or not isinstance(tables, list):
+            raise ValueError("'tables' parameter is required when calling batch_analyze_tables tool")
+        for item in tables:
+            if not isinstance(item, dict):
+                raise ValueError(f"Invalid table in batch_analyze_tables: {item}")
+            schema, table = item.get("schema"), item.get("table")
+            if not (isinstance(schema, str) and isinstance(table, str)
+                    and is_valid_identifier(schema) and is_valid_identifier(table)):
+                raise ValueError(f"Invalid table in batch_analyze_tables: {item}")
+            pairs.append((schema, table))
 
     try:
-        conn = redshift_connector.connect(
-            host=config['host'],
-            port=int(config['port']),
-            user=config['user'],
-            password=config['password'],
-            database=config['database'],
-        )
-        conn.autocommit = True
-
-        with conn.cursor() as cursor:
-            cursor.execute(sql)
-            if name == "analyze_table":
-                return [TextContent(type="text", text=f"Successfully analyzed table {schema}.{table}")]
-
-            if cursor.description is None:
-                return [TextContent(type="text", text=f"Successfully execute sql {sql}")]
-
-            columns = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            result = [",".join(map(str, row)) for row in rows]
-            return [TextContent(type="text", text="\n".join([",".join(columns)] +  result ))]
+        if name == "batch_analyze_tables":
+            statements = [f'ANALYZE "{schema}"."{table}"' for schema, table in pairs]
+            await run_pooled(_run_statements, statements)
+            analyzed = ", ".join(f"{schema}.{table}" for schema, table in pairs)
+            return [TextContent(type="text", text=f"Successfully analyzed tables {analyzed}")]
+
+        if name == "get_execution_plan":
+            text = await run_pooled(_run_plan, sql)
+        else:
+            text = await run_pooled(_run_query, sql)
+
+        if name == "analyze_table":
+            return [TextContent(type="text", text=f"Successfully analyzed table {schema}.{table}")]
+
+        if text is None:
+            # statements without a result set may be DDL
+            _clear_catalog_caches()
+            return [TextContent(type="text", text=f"Successfully execute sql {sql}")]
+
+        return [TextContent(type="text", text=text)]
     except Exception as e:
         return [TextContent(type="text", text=f"Error executing query: {str(e)}")]
-    finally:
-        conn.close()
+
+def _run_query(conn: Connection, sql: str) -> str | None:
+    """Execute sql and render its result set as CSV text, None if it returns no rows.
+
+    Rows are fetched in batches and handed to csv.writer, which serializes
+    them in a single pass and quotes values containing commas or newlines.
+    Output stops with a truncation marker after ``RS_MAX_ROWS`` rows or
+    before the row that would take it past ``RS_MAX_BYTES`` characters.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(sql)
+        if cursor.description is None:
+            return None
+
+        cursor.arraysize = batch_size
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(desc[0] for desc in cursor.description)
+        rows_returned = 0
+        truncated = False
+        while rows := cursor.fetchmany():
+            remaining = max_rows - rows_returned
+            if remaining <= 0:
+                truncated = True
+                break
+
+            batch = rows[:remaining]
+            start = buf.tell()
+            writer.writerows(batch)
+            if buf.tell() > max_bytes:
+                # this batch crosses the size cap, redo it row by row up to the cap
+                buf.seek(start)
+                buf.truncate()
+                for row in batch:
+                    row_start = buf.tell()
+                    writer.writerow(row)
+                    if buf.tell() > max_bytes:
+                        buf.seek(row_start)
+                        buf.truncate()
+                        break
+                    rows_returned += 1
+                truncated = True
+                break
+
+            rows_returned += len(batch)
+            if len(rows) > remaining:
+                truncated = True
+                break
+
+        if truncated:
+            buf.write(f"-- result truncated at {rows_returned} rows --\n")
+        return buf.getvalue()
+
+def _limit_sql(sql: str) -> str:
+    """Cap the LIMIT of a read-only SELECT or WITH, so Redshift never ships an unbounded result.
+
+    Only a LIMIT n at the end of the outer statement counts, one inside a
+    subquery, literal or comment does not. A missing LIMIT, LIMIT ALL or a
+    LIMIT above max_rows becomes max_rows + 1, so _run_query can still tell
+    the result was cut.
+    """
+    # comments become blanks and literals become placeholders of the same
+    # length, so offsets in masked map straight back onto sql
+    masked = _SQL_NOISE_RE.sub(lambda m: (" " if m.group(1) else "_") * len(m.group()), sql)
+    end = len(masked.rstrip().rstrip(';').rstrip())
+    masked = masked[:end]
+    if not _SELECT_RE.match(masked) or _WRITE_RE.search(masked) or ';' in masked:
+        return sql
+
+    tail = _TAIL_RE.search(masked)
+    if tail is None:
+        return sql
+    count = tail.group("count")
+    if count is not None and count.lower() != "all" and int(count) <= max_rows:
+        return sql
+    # LIMIT replaces a LIMIT ALL or one above max_rows and goes before a trailing OFFSET, trailing
+    # comments and semicolons are dropped
+    cut = tail.start("limit") if tail.group("limit") else tail.start("offset") if tail.group("offset") else end
+    offset = sql[tail.start("offset"):end] if tail.group("offset") else ""
+    return f"{sql[:cut].rstrip()}\nLIMIT {max_rows + 1}\n{offset}".rstrip()
+
+def _run_plan(conn: Connection, sql: str) -> str:
+    """Execute an EXPLAIN statement and return its plan as plain text lines.
+
+    The plan is a single text column, so the lines are joined directly
+    instead of going through csv.writer, which would also quote plan lines
+    that contain commas.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(sql)
+        lines = [cursor.description[0][0]]
+        lines.extend(row[0] for row in cursor)
+        return "\n".join(lines)
+
+def _run_statements(conn: Connection, statements: list[str]) -> None:
+    """Execute statements back to back on one cursor, ignoring any result sets."""
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
 
 def _get_schemas(conn: Connection ) -> str:
-   """Get all schemas from redshift database"""
+   """Get all schemas from redshift database, cached for a short time."""
+   schemas = _schema_cache.get(())
+   if schemas is not None:
+       return schemas
+
    sql = """
         SELECT nspname AS schema_name
         FROM pg_namespace
@@ -231,56 +687,106 @@ def _get_schemas(conn: Connection ) -> str:
    """
    with conn.cursor() as cursor:
        cursor.execute(sql)
-       rows = cursor.fetchall()
-       schemas = [row[0] for row in rows]
-       return "\n".join(schemas)
+       schemas = "\n".join(row[0] for row in cursor)
+
+   _schema_cache.put((), schemas)
+   return schemas
 
 def _get_tables(conn: Connection, schema: str) -> str:
-   """Get all tables in a schema from redshift database."""
+   """Get all tables in a schema from redshift database, cached for a short time."""
+   tables = _table_cache.get((schema,))
+   if tables is not None:
+       return tables
+
    sql = f"""
         SELECT table_name FROM information_schema.tables
         WHERE table_schema = %s
-        GROUP BY table_name
         ORDER BY table_name
    """
    with conn.cursor() as cursor:
        cursor.execute(sql, [schema])
-       rows = cursor.fetchall()
-       tables = [row[0] for row in rows]
-       return "\n".join(tables)
+       tables = "\n".join(row[0] for row in cursor)
+
+   _table_cache.put((schema,), tables)
+   return tables
 
 def _get_table_ddl(conn: Connection, schema: str, table: str) -> str:
-   """Get DDL for a table from redshift database."""
+   """Get DDL for a table from redshift database, cached for a short time."""
+   ddl = _ddl_cache.get((schema, table))
+   if ddl is not None:
+       return ddl
 
    with conn.cursor() as cursor:
-       cursor.execute(
-           """
-            SELECT 'SHOW TABLE ' || quote_ident(%s) || '.' || quote_ident(%s) AS query
-           """, [schema, table])
-
-       query = cursor.fetchone()
-       if not query or not query[0]:
+       if _IDENT_RE.match(schema) and _IDENT_RE.match(table):
+           # plain identifiers are quoted locally, saving a quote_ident round trip
+           query = f'SHOW TABLE "{schema}"."{table}"'
+       else:
+           cursor.execute(
+               """
+                SELECT 'SHOW TABLE ' || quote_ident(%s) || '.' || quote_ident(%s) AS query
+               """, [schema, table])
+
+           row = cursor.fetchone()
+           if not row or not row[0]:
+               return f"No DDL found for {schema}.{table}"
+           query = row[0]
+
+       cursor.execute(query)
+       row = cursor.fetchone()
+       if not row or not row[0]:
            return f"No DDL found for {schema}.{table}"
 
-       cursor.execute(query[0])
-       ddl = cursor.fetchone()
-       return ddl[0] if ddl and ddl[0] else f"No DDL found for {schema}.{table}"
+       _ddl_cache.put((schema, table), row[0])
+       return row[0]
 
-def _get_table_statistic(conn: Connection, schema: str, table: str) -> str:
-   """Get statistic for a table from redshift database."""
+def _get_schema_ddl(conn: Connection, schema: str) -> str:
+   """Get DDL for all base tables in a schema, reusing one connection for every table.
 
+   A table whose DDL cannot be read (no privilege, dropped meanwhile) gets an
+   error line instead of failing the whole schema.
+   """
+   sql = """
+        SELECT table_name FROM information_schema.tables
+        WHERE table_schema = %s AND table_type = 'BASE TABLE'
+        ORDER BY table_name
+   """
    with conn.cursor() as cursor:
+       cursor.execute(sql, [schema])
+       tables = [row[0] for row in cursor]
+
+   if not tables:
+       return f"No tables found in {schema}"
+
+   ddls = []
+   for table in tables:
+       try:
+           ddls.append(_get_table_ddl(conn, schema, table))
+       except (redshift_connector.InterfaceError, redshift_connector.OperationalError):
+           # the connection itself is broken, let the pool handle it
+           raise
+       except Exception as e:
+           ddls.append(f"-- Failed to get DDL for {schema}.{table}: {str(e)}")
+   return "\n\n".join(ddls)
 
-       cursor.execute(
-           """
-            SELECT 'ANALYZE ' || quote_ident(%s) || '.' || quote_ident(%s) AS query
-           """, [schema, table])
-
-       query = cursor.fetchone()
-       if not query or not query[0]:
-           return f"No DDL found for {schema}.{table}"
+def _get_table_statistic(conn: Connection, schema: str, table: str) -> str:
+   """Get statistic for a table from redshift database."""
 
-       cursor.execute(query[0])
+   with conn.cursor() as cursor:
+       if _IDENT_RE.match(schema) and _IDENT_RE.match(table):
+           # plain identifiers are quoted locally, saving a quote_ident round trip
+           query = f'ANALYZE "{schema}"."{table}"'
+       else:
+           cursor.execute(
+               """
+                SELECT 'ANALYZE ' || quote_ident(%s) || '.' || quote_ident(%s) AS query
+               """, [schema, table])
+
+           row = cursor.fetchone()
+           if not row or not row[0]:
+               return f"No DDL found for {schema}.{table}"
+           query = row[0]
+
+       cursor.execute(query)
        return f"ANALYZE {schema}.{table} command executed"
 
 async def run():
@@ -288,6 +794,7 @@ async def run():
     from mcp.server.stdio import stdio_server
 
     async with stdio_server() as (read_stream, write_stream):
+        warm_pool()
         try:
             logger.info("start to init Redshift MCP Server")
             await server.run(
@@ -296,8 +803,13 @@ async def run():
                 server.create_initialization_options()
             )
         except Exception as e:
-            logger.warning(f"MCP Server Error: {str(e)}")
+            logger.error("MCP Server Error: %s", e, exc_info=True)
             raise
+        finally:
+            # do not wait for running queries here, close_pool closes their
+            # connections so their workers fail and exit
+            _DB_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            close_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+import pytest
+
+from redshift_mcp_server import server
+
+
+@pytest.fixture(autouse=True)
+def small_caps(monkeypatch):
+    monkeypatch.setattr(server, "max_rows", 3)
+    monkeypatch.setattr(server, "max_bytes", 1_000_000)
+    monkeypatch.setattr(server, "batch_size", 2)
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("SELECT * FROM t", "SELECT * FROM t\nLIMIT 4"),
+    ("select * from t;", "select * from t\nLIMIT 4"),
+    ("SELECT a FROM t -- all rows", "SELECT a FROM t\nLIMIT 4"),
+    ("SELECT a FROM t; -- all rows", "SELECT a FROM t\nLIMIT 4"),
+    ("SELECT a -- first column\nFROM t", "SELECT a -- first column\nFROM t\nLIMIT 4"),
+    ("SELECT a FROM t ORDER BY a OFFSET 5", "SELECT a FROM t ORDER BY a\nLIMIT 4\nOFFSET 5"),
+    ("SELECT a FROM t LIMIT ALL", "SELECT a FROM t\nLIMIT 4"),
+    # a LIMIT above max_rows is capped
+    ("SELECT * FROM t LIMIT 100000000", "SELECT * FROM t\nLIMIT 4"),
+    ("select * from t limit 10 offset 20;", "select * from t\nLIMIT 4\noffset 20"),
+    ("SELECT * FROM t OFFSET 20 LIMIT 10", "SELECT * FROM t OFFSET 20\nLIMIT 4"),
+    ("SELECT a FROM t LIMIT 10 -- first ten", "SELECT a FROM t\nLIMIT 4"),
+    # a read-only WITH is treated like a SELECT
+    ("WITH x AS (SELECT 1) SELECT * FROM x", "WITH x AS (SELECT 1) SELECT * FROM x\nLIMIT 4"),
+    # LIMIT inside a subquery, literal, comment or quoted identifier is not the outer LIMIT
+    ("SELECT * FROM t WHERE id IN (SELECT id FROM u LIMIT 10)",
+     "SELECT * FROM t WHERE id IN (SELECT id FROM u LIMIT 10)\nLIMIT 4"),
+    ("SELECT * FROM t WHERE a = 'limit 5'", "SELECT * FROM t WHERE a = 'limit 5'\nLIMIT 4"),
+    ("SELECT * FROM t /* limit 5 */", "SELECT * FROM t\nLIMIT 4"),
+    ("SELECT * /* limit 5 */ FROM t", "SELECT * /* limit 5 */ FROM t\nLIMIT 4"),
+    ('SELECT "into" FROM t', 'SELECT "into" FROM t\nLIMIT 4'),
+])
+def test_limit_sql_adds_limit(sql, expected):
+    assert server._limit_sql(sql) == expected
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM t LIMIT 2",
+    "select * from t limit 3 offset 20;",
+    "SELECT * FROM t OFFSET 20 LIMIT 2",
+    "SELECT a FROM t LIMIT 2 -- first two",
+    "SELECT * INTO t2 FROM t",
+    "WITH x AS (SELECT 1) INSERT INTO t SELECT * FROM x",
+    "WITH x AS (SELECT id FROM u) DELETE FROM t USING x WHERE t.id = x.id",
+    "INSERT INTO t SELECT * FROM u",
+    "SELECT 1; SELECT 2",
+    "SELECT 'a' INTO t2",
+])
+def test_limit_sql_leaves_statement_alone(sql):
+    assert server._limit_sql(sql) == sql
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.description = [("id",), ("name",)]
+        self.arraysize = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        pass
+
+    def fetchmany(self):
+        batch, self.rows = self.rows[:self.arraysize], self.rows[self.arraysize:]
+        return batch
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self):
+        return FakeCursor(self.rows)
+
+
+def test_run_query_quotes_csv_values():
+    text = server._run_query(FakeConnection([(1, "a,b"), (2, None)]), "q")
+    assert text == 'id,name\n1,"a,b"\n2,\n'
+
+
+def test_run_query_row_cap():
+    text = server._run_query(FakeConnection([(i, "x") for i in range(4)]), "q")
+    assert text == "id,name\n0,x\n1,x\n2,x\n-- result truncated at 3 rows --\n"
+
+
+def test_run_query_exact_row_cap_is_not_truncated():
+    text = server._run_query(FakeConnection([(i, "x") for i in range(3)]), "q")
+    assert text == "id,name\n0,x\n1,x\n2,x\n"
+
+
+def test_run_query_byte_cap_stops_within_a_batch(monkeypatch):
+    monkeypatch.setattr(server, "max_rows", 1000)
+    monkeypatch.setattr(server, "batch_size", 100)
+    monkeypatch.setattr(server, "max_bytes", 40)
+    text = server._run_query(FakeConnection([(i, "value") for i in range(50)]), "q")
+    data, marker = text.rsplit("-- result truncated", 1)
+    assert len(data) <= 40
+    assert data == "id,name\n0,value\n1,value\n2,value\n3,value\n"
+    assert marker == " at 4 rows --\n"
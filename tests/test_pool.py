@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import redshift_connector
+
+from redshift_mcp_server import server
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.conn.executed.append(sql)
+        if self.conn.broken:
+            raise ConnectionResetError("connection reset by peer")
+
+    def fetchall(self):
+        return [(1,)]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.broken = False
+        self.closed = False
+        self.in_transaction = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(server, "_connect", connect)
+    monkeypatch.setattr(server, "_pool", None)
+    monkeypatch.setattr(server, "_pool_slots", None)
+    monkeypatch.setattr(server, "_warming", [])
+    monkeypatch.setattr(server, "_pool_closed", False)
+    monkeypatch.setattr(server, "_checked_out", set())
+    return opened
+
+
+def execute(conn, sql):
+    with conn.cursor() as cursor:
+        cursor.execute(sql)
+    return sql
+
+
+def test_connection_is_reused(connections):
+    async def main():
+        await server.run_pooled(execute, "SELECT 1")
+        await server.run_pooled(execute, "SELECT 2")
+
+    asyncio.run(main())
+    assert len(connections) == 1
+
+
+def test_stale_idle_connection_is_replaced_before_use(connections):
+    async def main():
+        await server.run_pooled(execute, "SELECT 1")
+        connections[0].broken = True
+        return await server.run_pooled(execute, "INSERT INTO t VALUES (1)")
+
+    assert asyncio.run(main()) == "INSERT INTO t VALUES (1)"
+    assert connections[0].closed
+    assert "INSERT INTO t VALUES (1)" not in connections[0].executed
+    assert connections[1].executed == ["INSERT INTO t VALUES (1)"]
+
+
+def test_failing_statement_runs_only_once(connections):
+    def insert_then_drop(conn, sql):
+        execute(conn, sql)
+        raise redshift_connector.InterfaceError("BrokenPipe: server socket closed")
+
+    async def main():
+        await server.run_pooled(execute, "SELECT 1")
+        with pytest.raises(redshift_connector.InterfaceError):
+            await server.run_pooled(insert_then_drop, "INSERT INTO t VALUES (1)")
+
+    asyncio.run(main())
+    executed = [sql for conn in connections for sql in conn.executed]
+    assert executed.count("INSERT INTO t VALUES (1)") == 1
+    assert connections[0].closed
+
+
+def test_connection_in_transaction_is_not_pooled(connections):
+    def begin(conn, sql):
+        conn.in_transaction = True
+        return sql
+
+    async def main():
+        await server.run_pooled(begin, "BEGIN")
+        await server.run_pooled(execute, "SELECT 1")
+
+    asyncio.run(main())
+    assert connections[0].closed
+    assert len(connections) == 2
+
+
+def test_cancelled_request_closes_connection_after_worker_finishes(connections):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(conn, sql):
+        started.set()
+        release.wait(5)
+        return sql
+
+    async def main():
+        task = asyncio.create_task(server.run_pooled(slow, "SELECT pg_sleep(60)"))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # the worker is still inside the statement, the connection must stay open
+        assert not connections[0].closed
+        assert server._pool_slots._value == server.pool_size - 1
+
+        release.set()
+        for _ in range(100):
+            if server._pool_slots._value == server.pool_size:
+                break
+            await asyncio.sleep(0.01)
+        assert server._pool_slots._value == server.pool_size
+
+    asyncio.run(main())
+    assert connections[0].closed
+    assert server._pool.qsize() == 0
+
+
+def test_request_during_warm_up_takes_over_a_warm_connection(connections, monkeypatch):
+    gate = threading.Event()
+    connect = server._connect
+
+    def slow_connect():
+        gate.wait(5)
+        return connect()
+
+    monkeypatch.setattr(server, "_connect", slow_connect)
+
+    async def main():
+        server.warm_pool()
+        task = asyncio.create_task(server.run_pooled(execute, "SELECT 1"))
+        await asyncio.sleep(0.05)
+        gate.set()
+        await task
+        for _ in range(100):
+            if not server._warming:
+                break
+            await asyncio.sleep(0.01)
+        assert server._pool.qsize() == server.pool_size
+
+    asyncio.run(main())
+    assert len(connections) == server.pool_size
+    assert not any(conn.closed for conn in connections)
+
+
+def test_close_pool_closes_connections_in_use(connections):
+    started = threading.Event()
+
+    def wait_for_close(conn, sql):
+        started.set()
+        for _ in range(500):
+            if conn.closed:
+                raise redshift_connector.InterfaceError("connection closed")
+            time.sleep(0.01)
+        return sql
+
+    async def main():
+        task = asyncio.create_task(server.run_pooled(wait_for_close, "SELECT pg_sleep(60)"))
+        await asyncio.to_thread(started.wait, 5)
+        server.close_pool()
+        with pytest.raises(redshift_connector.InterfaceError):
+            await task
+
+    asyncio.run(main())
+    assert connections[0].closed
+    assert not server._checked_out